@@ -10,29 +10,31 @@ Single-file, production-ready, easy to modify with built-in configuration.
 from __future__ import annotations
 
 import asyncio
+import codecs
 import logging
 import random
 import re
 import signal
 import sys
-from collections import defaultdict, deque
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, Dict, List, Optional
+from itertools import islice
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 # Third-party deps
-# pip install discord aiohttp beautifulsoup4 ollama spotipy
+# pip install discord aiohttp beautifulsoup4 lxml ollama
 import aiohttp
 import discord
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import ollama  # type: ignore
 
-# Spotify is optional
+# lxml is optional but much faster than the pure-Python parser
 try:
-    import spotipy  # type: ignore
-    from spotipy.oauth2 import SpotifyClientCredentials  # type: ignore
+    import lxml  # type: ignore  # noqa: F401
+    HTML_PARSER = "lxml"
 except Exception:  # pragma: no cover
-    spotipy = None
-    SpotifyClientCredentials = None
+    HTML_PARSER = "html.parser"
 
 
 # ====================
@@ -103,6 +105,8 @@ class Config:
     random_message_enabled: bool = False
     random_interval_min_s: int = 900   # 15 minutes
     random_interval_max_s: int = 1800  # 30 minutes
+    # Channels to post in per tick; values > 1 need OLLAMA_NUM_PARALLEL > 1 on the Ollama server
+    random_batch_size: int = 1
     
     # Web Scraping Configuration
     user_agent: str = (
@@ -111,6 +115,7 @@ class Config:
     )
     max_content_chars: int = 2000
     http_total_timeout: int = 10
+    max_urls_per_message: int = 5  # extra links in a message are ignored
     
     # Bot Behavior
     master_instruction: str = DEFAULT_MASTER_INSTRUCTION
@@ -138,9 +143,16 @@ def setup_logging(level: str) -> None:
 # ====================
 
 URL_RE = re.compile(r"https?://[^\s>]+", re.IGNORECASE)
+SPOTIFY_TRACK_RE = re.compile(r"open\.spotify\.com/track/([A-Za-z0-9]+)")
+_WS_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
 
 def extract_urls(text: str) -> List[str]:
-    return URL_RE.findall(text or "")
+    # Cheap pre-check: most messages have no links, so skip the regex scan
+    if not text or "://" not in text:
+        return []
+    return URL_RE.findall(text)
+
+HELP_COMMANDS = ("!crackgpt help", "!cg help", "!help cg")
 
 def is_channel_allowed(channel_id: int, allowed_ids: List[int]) -> bool:
     return (not allowed_ids) or (channel_id in allowed_ids)
@@ -150,83 +162,150 @@ def is_channel_allowed(channel_id: int, allowed_ids: List[int]) -> bool:
 # Spotify Helpers
 # ====================
 
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+SPOTIFY_RETRIES = 2            # extra attempts on 401/429/5xx (same as spotipy's default here)
+SPOTIFY_MAX_RETRY_AFTER_S = 5  # don't hold up a reply longer than this on a 429
+
 class SpotifyClient:
+    """Minimal async Spotify Web API client (client-credentials flow)."""
+
     def __init__(self, cfg: Config):
         self.cfg = cfg
-        self._client: Optional["spotipy.Spotify"] = None
-        if self.cfg.enable_spotify and spotipy and self.cfg.spotify_client_id and self.cfg.spotify_client_secret:
-            try:
-                auth = SpotifyClientCredentials(
-                    client_id=self.cfg.spotify_client_id,
-                    client_secret=self.cfg.spotify_client_secret,
-                )
-                self._client = spotipy.Spotify(auth_manager=auth, requests_timeout=5, retries=2)
-                logging.info("Spotify client initialized.")
-            except Exception as e:  # pragma: no cover
-                logging.warning("Spotify init failed: %s", e)
+        self.enabled = bool(
+            self.cfg.enable_spotify and self.cfg.spotify_client_id and self.cfg.spotify_client_secret
+        )
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+        if self.enabled:
+            logging.info("Spotify client initialized.")
         elif self.cfg.enable_spotify:
-            logging.warning("Spotify enabled but credentials or library missing. Feature will be disabled.")
+            logging.warning("Spotify enabled but credentials missing. Feature will be disabled.")
 
     @staticmethod
     def extract_track_id(url: str) -> Optional[str]:
         # https://open.spotify.com/track/<id>
-        m = re.search(r"open\.spotify\.com/track/([A-Za-z0-9]+)", url)
-        if m:
-            return m.group(1)
-        return None
-
-    async def get_track_info(self, track_id: str) -> Optional[Dict[str, Any]]:
-        if not self._client:
+        if "open.spotify.com/track/" not in url:
+            return None
+        m = SPOTIFY_TRACK_RE.search(url)
+        return m.group(1) if m else None
+
+    async def _get_token(self, session: aiohttp.ClientSession) -> Optional[str]:
+        if self._token and time.monotonic() < self._token_expires:
+            return self._token
+        # Only one refresh at a time when several tracks are looked up concurrently
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires:
+                return self._token
+            auth = aiohttp.BasicAuth(self.cfg.spotify_client_id, self.cfg.spotify_client_secret)
+            async with session.post(
+                SPOTIFY_TOKEN_URL, data={"grant_type": "client_credentials"}, auth=auth
+            ) as resp:
+                if resp.status != 200:
+                    logging.debug("Spotify token request failed: HTTP %s", resp.status)
+                    return None
+                data = await resp.json()
+            self._token = data.get("access_token")
+            # refresh a minute before Spotify expires it
+            self._token_expires = time.monotonic() + int(data.get("expires_in", 3600)) - 60
+            return self._token
+
+    async def get_track_info(self, session: aiohttp.ClientSession, track_id: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            for attempt in range(SPOTIFY_RETRIES + 1):
+                token = await self._get_token(session)
+                if not token:
+                    return None
+                headers = {"Authorization": f"Bearer {token}"}
+                async with session.get(f"{SPOTIFY_API_URL}/tracks/{track_id}", headers=headers) as resp:
+                    if resp.status == 200:
+                        tr = await resp.json()
+                        break
+                    if attempt == SPOTIFY_RETRIES:
+                        return None
+                    if resp.status == 401:
+                        self._token = None  # revoked/expired early; retry with a fresh one
+                        continue
+                    if resp.status == 429:
+                        try:
+                            delay = float(resp.headers.get("Retry-After", 1))
+                        except ValueError:
+                            delay = 1.0
+                    elif resp.status >= 500:
+                        delay = 0.5 * (attempt + 1)
+                    else:
+                        return None
+                await asyncio.sleep(min(max(delay, 0.0), SPOTIFY_MAX_RETRY_AFTER_S))
+            album = tr.get("album") or {}
+            return {
+                "name": tr.get("name"),
+                "artist": ", ".join(a["name"] for a in tr.get("artists", []) if "name" in a),
+                "album": album.get("name"),
+                "release_date": album.get("release_date"),
+                "duration_ms": tr.get("duration_ms"),
+                "popularity": tr.get("popularity"),
+            }
+        except Exception as e:  # pragma: no cover
+            logging.debug("Spotify track fetch failed: %s", e)
             return None
-        loop = asyncio.get_running_loop()
-        # Run blocking spotipy call in executor
-        def _fetch() -> Optional[Dict[str, Any]]:
-            try:
-                tr = self._client.track(track_id)
-                return {
-                    "name": tr.get("name"),
-                    "artist": ", ".join(a["name"] for a in tr.get("artists", []) if "name" in a),
-                    "album": tr.get("album", {}).get("name"),
-                    "release_date": tr.get("album", {}).get("release_date"),
-                    "duration_ms": tr.get("duration_ms"),
-                    "popularity": tr.get("popularity"),
-                }
-            except Exception as e:  # pragma: no cover
-                logging.debug("Spotify track fetch failed: %s", e)
-                return None
-        return await loop.run_in_executor(None, _fetch)
 
 
 # ====================
 # Web Scraping
 # ====================
 
+# Title + lead paragraphs fit well within this; bounds cost on bloated pages
+MAX_HTML_BYTES = 256 * 1024
+
+# Enrichment cache (reposted links / Spotify tracks)
+URL_CACHE_TTL_S = 600
+URL_CACHE_MAX_ENTRIES = 1024
+
+def _parse_html(html: str, limit: int) -> Optional[str]:
+    # Only build the tags we actually read
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer(["title", "p", "li"]))
+    title = (soup.title.string or "").strip() if soup.title else ""
+    texts: List[str] = []
+    total = 0
+    for tag in soup.find_all(["p", "li"]):
+        t = tag.get_text(strip=True)
+        if t:
+            texts.append(t)
+            total += len(t)
+        if total > limit:
+            break
+    body = " ".join(texts)[:limit]
+    if title:
+        return f"{title}\n{body}"
+    return body or None
+
 async def fetch_url_text(session: aiohttp.ClientSession, url: str, cfg: Config) -> Optional[str]:
     try:
         headers = {"User-Agent": cfg.user_agent}
-        timeout = aiohttp.ClientTimeout(total=cfg.http_total_timeout)
-        async with session.get(url, headers=headers, timeout=timeout, allow_redirects=True) as resp:
+        async with session.get(url, headers=headers, allow_redirects=True) as resp:
             if resp.status != 200 or "text/html" not in (resp.headers.get("Content-Type") or ""):
                 return None
-            html = await resp.text(errors="ignore")
+            buf = bytearray()
+            async for chunk in resp.content.iter_chunked(8192):
+                buf.extend(chunk)
+                if len(buf) >= MAX_HTML_BYTES:
+                    break
+            # Unknown charset names (e.g. "utf8mb4") fall back to utf-8 like resp.text() does
+            try:
+                enc = codecs.lookup(resp.charset or "utf-8").name
+            except LookupError:
+                enc = "utf-8"
+            html = buf.decode(enc, errors="ignore")
     except Exception as e:
         logging.debug("Fetch failed for %s: %s", url, e)
         return None
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        title = (soup.title.string or "").strip() if soup.title else ""
-        texts: List[str] = []
-        for tag in soup.find_all(["p", "li"]):
-            t = tag.get_text(strip=True)
-            if t:
-                texts.append(t)
-            if sum(len(x) for x in texts) > cfg.max_content_chars:
-                break
-        body = " ".join(texts)[: cfg.max_content_chars]
-        if title:
-            return f"{title}\n{body}"
-        return body or None
+        # Parse off the event loop so large pages don't stall the gateway heartbeat
+        return await asyncio.to_thread(_parse_html, html, cfg.max_content_chars)
     except Exception as e:  # pragma: no cover
         logging.debug("Parse failed for %s: %s", url, e)
         return None
@@ -242,35 +321,87 @@ class ChannelState:
     toggle_on: bool = True  # per-channel master instruction toggle
     active: bool = False    # seen messages recently
     bot_messages: set = field(default_factory=set)  # Track bot's own message IDs
+    last_seen: float = 0.0  # monotonic time of last user interaction
 
 
+# Channels with no interaction for this long are dropped from memory
+CHANNEL_IDLE_TTL_S = 24 * 3600
+CHANNEL_SWEEP_INTERVAL_S = 3600
+
 class State:
     def __init__(self, cfg: Config):
         self.cfg = cfg
-        self.channels: Dict[int, ChannelState] = defaultdict(ChannelState)
+        # History bound is fixed for the process lifetime; bake it into new channels
+        self._maxlen = max(cfg.max_history_turns * 2, 6)
+        self.channels: Dict[int, ChannelState] = {}
+        # Channels eligible for random chatter, kept in sync with ChannelState.active
+        self.active_channels: set[int] = set()
+        # Only two possible system prompts; build them once
+        self._sys_on = build_system_prompt(cfg, True)
+        self._sys_off = build_system_prompt(cfg, False)
+
+    def get_or_create(self, channel_id: int) -> ChannelState:
+        """Return the channel's state, creating it on first use"""
+        st = self.channels.get(channel_id)
+        if st is None:
+            st = self.channels[channel_id] = ChannelState(
+                history=deque(maxlen=self._maxlen), last_seen=time.monotonic()
+            )
+        return st
 
     def get_history(self, channel_id: int) -> Deque[Dict[str, str]]:
-        hist = self.channels[channel_id].history
-        # ensure configured maxlen
-        if hist.maxlen != max(self.cfg.max_history_turns * 2, 6):
-            hist = self.channels[channel_id].history = deque(hist, maxlen=max(self.cfg.max_history_turns * 2, 6))
-        return hist
+        return self.get_or_create(channel_id).history
+
+    def system_prompt(self, channel_id: int) -> str:
+        st = self.channels.get(channel_id)
+        return self._sys_off if st and not st.toggle_on else self._sys_on
 
     def toggle(self, channel_id: int) -> bool:
-        st = self.channels[channel_id]
+        st = self.get_or_create(channel_id)
         st.toggle_on = not st.toggle_on
+        st.last_seen = time.monotonic()
         return st.toggle_on
 
     def mark_active(self, channel_id: int) -> None:
-        self.channels[channel_id].active = True
+        st = self.get_or_create(channel_id)
+        st.active = True
+        st.last_seen = time.monotonic()
+        self.active_channels.add(channel_id)
+
+    def mark_inactive(self, channel_id: int) -> None:
+        st = self.channels.get(channel_id)
+        if st:
+            st.active = False
+        self.active_channels.discard(channel_id)
 
     def add_bot_message(self, channel_id: int, message_id: int) -> None:
         """Track a message ID as sent by the bot"""
-        self.channels[channel_id].bot_messages.add(message_id)
+        self.get_or_create(channel_id).bot_messages.add(message_id)
 
     def is_bot_message(self, channel_id: int, message_id: int) -> bool:
         """Check if a message ID was sent by the bot"""
-        return message_id in self.channels[channel_id].bot_messages
+        st = self.channels.get(channel_id)
+        return bool(st) and message_id in st.bot_messages
+
+    def evict_idle(self, max_idle_s: float) -> int:
+        """Forget channels with no interaction in max_idle_s; returns how many were affected"""
+        cutoff = time.monotonic() - max_idle_s
+        stale = [cid for cid, st in self.channels.items() if st.last_seen < cutoff]
+        removed = 0
+        for cid in stale:
+            st = self.channels[cid]
+            if st.toggle_on:
+                del self.channels[cid]
+            elif st.history or st.bot_messages or st.active:
+                # Keep the user's style toggle; drop only the bulky per-channel data
+                st.history.clear()
+                st.bot_messages.clear()
+                st.active = False
+            else:
+                continue  # already cleared on an earlier pass
+            self.active_channels.discard(cid)
+            removed += 1
+        return removed
 
 
 # ====================
@@ -285,7 +416,11 @@ def build_ollama_messages(
     system_prompt: str, history: Deque[Dict[str, str]]
 ) -> List[Dict[str, str]]:
     msgs: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
-    msgs.extend(list(history)[-50:])  # safety cap
+    # safety cap; the deque is normally bounded well below this, so avoid copying
+    if len(history) <= 50:
+        msgs.extend(history)
+    else:
+        msgs.extend(islice(history, len(history) - 50, None))
     return msgs
 
 
@@ -295,37 +430,62 @@ def build_ollama_messages(
 
 class CrackGPTBot(discord.Client):
     def __init__(self, cfg: Config, state: State, spotify_client: SpotifyClient):
-        intents = discord.Intents.default()
+        # Only subscribe to the gateway events we actually handle
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
+        intents.dm_messages = True
         intents.message_content = True
         super().__init__(intents=intents)
         self.cfg = cfg
         self.state = state
         self.spotify = spotify_client
         self._random_task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._url_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._ollama = ollama.AsyncClient(timeout=cfg.ollama_timeout_sec)
+        self._toggle_kw = cfg.toggle_keyword.lower()
+        # Commands all fit in this many leading chars; only that much gets lowercased
+        self._cmd_prefix_len = max(32, len(self._toggle_kw))
+        self._command_prefixes = (self._toggle_kw,) + HELP_COMMANDS
         self.log = logging.getLogger("CrackGPTBot")
 
     async def setup_hook(self) -> None:
+        # One pooled HTTP session for the bot's lifetime (keep-alive + DNS cache)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.cfg.http_total_timeout),
+        )
+
         # Start random chatter loop if enabled
         if self.cfg.random_message_enabled:
             self._random_task = asyncio.create_task(self.random_chatter_loop())
             self.log.info("Random chatter loop started.")
 
+        self._sweep_task = asyncio.create_task(self.channel_sweep_loop())
+
     async def close(self) -> None:
-        if self._random_task:
-            self._random_task.cancel()
-            try:
-                await self._random_task
-            except Exception:
-                pass
+        for task in (self._random_task, self._sweep_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        if self._session:
+            await self._session.close()
+        await self._ollama.close()
         await super().close()
 
     async def on_ready(self) -> None:
         self.log.info("Logged in as %s (id=%s)", self.user, self.user and self.user.id)
 
-    def should_respond_to_message(self, message: discord.Message) -> bool:
-        """Check if the bot should respond to this message"""
+    def should_respond_to_message(self, message: discord.Message, prefix: str) -> bool:
+        """Check if the bot should respond to this message (prefix: lowercased command prefix)"""
         # Always respond to commands
-        if message.content.strip().lower().startswith((self.cfg.toggle_keyword.lower(), "!crackgpt help", "!cg help", "!help cg")):
+        if prefix.startswith(self._command_prefixes):
             return True
 
         # Check if bot was mentioned
@@ -340,6 +500,55 @@ class CrackGPTBot(discord.Client):
 
         return False
 
+    async def _cached(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a recent result for key, sharing one in-flight fetch between callers."""
+        hit = self._url_cache.get(key)
+        if hit and time.monotonic() - hit[0] < URL_CACHE_TTL_S:
+            self._url_cache.move_to_end(key)
+            return hit[1]
+
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fetch())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._store_cached(key, f))
+        # shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(fut)
+
+    def _store_cached(self, key: str, fut: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if fut.cancelled() or fut.exception() is not None or fut.result() is None:
+            return
+        self._url_cache[key] = (time.monotonic(), fut.result())
+        self._url_cache.move_to_end(key)
+        while len(self._url_cache) > URL_CACHE_MAX_ENTRIES:
+            self._url_cache.popitem(last=False)
+
+    async def _enrich_one(self, url: str) -> Optional[str]:
+        """Build a single context line for a URL (Spotify track or web page)."""
+        # Spotify
+        if self.spotify.enabled and self._session:
+            tid = self.spotify.extract_track_id(url)
+            if tid:
+                info = await self._cached(
+                    f"spotify:{tid}", lambda: self.spotify.get_track_info(self._session, tid)
+                )
+                if info:
+                    return (
+                        f"🎵 Spotify Track → {info['name']} by {info['artist']} "
+                        f"(album: {info['album']}, released: {info['release_date']}, "
+                        f"popularity: {info['popularity']})"
+                    )
+
+        # Generic web page
+        if self.cfg.enable_web_scraping and self._session:
+            txt = await self._cached(url, lambda: fetch_url_text(self._session, url, self.cfg))
+            if txt:
+                # Slice before flattening so we never touch more than we keep
+                one_liner = txt[:600].translate(_WS_TABLE).strip()
+                return f"🔗 {url} → {one_liner[:300]}"
+        return None
+
     async def on_message(self, message: discord.Message) -> None:
         # Basic filters
         if not message.content:
@@ -354,12 +563,13 @@ class CrackGPTBot(discord.Client):
         content = message.content.strip()
 
         # Commands (always respond to these)
-        if content.lower().startswith(self.cfg.toggle_keyword.lower()):
+        prefix = content[: self._cmd_prefix_len].lower()
+        if prefix.startswith(self._toggle_kw):
             new_state = self.state.toggle(channel_id)
             await message.channel.send(f"CrackGPT style toggle is now **{'ON' if new_state else 'OFF'}** for this channel.")
             return
 
-        if content.lower() in {"!crackgpt help", "!cg help", "!help cg"}:
+        if len(content) <= self._cmd_prefix_len and prefix in HELP_COMMANDS:
             await message.channel.send(
                 "Commands:\n"
                 f"- `{self.cfg.toggle_keyword}` — toggle style guidance for this channel\n"
@@ -369,7 +579,7 @@ class CrackGPTBot(discord.Client):
             return
 
         # Check if we should respond to this message
-        if not self.should_respond_to_message(message):
+        if not self.should_respond_to_message(message, prefix):
             return
 
         # Mark channel as active for random chatter eligibility
@@ -387,29 +597,20 @@ class CrackGPTBot(discord.Client):
         history.append({"role": "user", "content": f"{message.author.display_name}: {clean_content}"})
 
         # 2) Enrichment: URLs + Spotify
-        urls = extract_urls(clean_content)
+        # Drop repeated links (order-preserving), then cap fan-out and prompt size
+        urls = list(dict.fromkeys(extract_urls(clean_content)))[: self.cfg.max_urls_per_message]
         enrich_lines: List[str] = []
-        async with aiohttp.ClientSession() as session:
-            for url in urls:
-                # Spotify
-                if self.cfg.enable_spotify and self.spotify:
-                    tid = self.spotify.extract_track_id(url)
-                    if tid:
-                        info = await self.spotify.get_track_info(tid)
-                        if info:
-                            enrich_lines.append(
-                                f"🎵 Spotify Track → {info['name']} by {info['artist']} "
-                                f"(album: {info['album']}, released: {info['release_date']}, "
-                                f"popularity: {info['popularity']})"
-                            )
-                            continue
-
-                # Generic web page
-                if self.cfg.enable_web_scraping:
-                    txt = await fetch_url_text(session, url, self.cfg)
-                    if txt:
-                        one_liner = txt.replace("\n", " ").strip()
-                        enrich_lines.append(f"🔗 {url} → {one_liner[:300]}")
+        if urls:
+            # Fetch all links concurrently; results come back in URL order
+            results = await asyncio.gather(
+                *(self._enrich_one(url) for url in urls),
+                return_exceptions=True,
+            )
+            for line in results:
+                if isinstance(line, BaseException):
+                    self.log.debug("Enrichment failed: %s", line)
+                elif line:
+                    enrich_lines.append(line)
 
         # 3) If enriched, append as a system note to history for model context
         if enrich_lines:
@@ -419,7 +620,7 @@ class CrackGPTBot(discord.Client):
             })
 
         # 4) Compose prompt/messages for Ollama
-        sys_prompt = build_system_prompt(self.cfg, self.state.channels[channel_id].toggle_on)
+        sys_prompt = self.state.system_prompt(channel_id)
         messages = build_ollama_messages(sys_prompt, history)
 
         # 5) Call Ollama with retries
@@ -427,7 +628,7 @@ class CrackGPTBot(discord.Client):
         for attempt in range(3):
             try:
                 resp = await asyncio.wait_for(
-                    asyncio.to_thread(ollama.chat, model=self.cfg.ollama_model, messages=messages),
+                    self._ollama.chat(model=self.cfg.ollama_model, messages=messages),
                     timeout=self.cfg.ollama_timeout_sec,
                 )
                 reply = (resp or {}).get("message", {}).get("content", None)
@@ -435,11 +636,20 @@ class CrackGPTBot(discord.Client):
                     break
             except asyncio.TimeoutError:
                 self.log.warning("Ollama timeout (attempt %s/3).", attempt + 1)
+            except ollama.ResponseError as e:
+                self.log.warning("Ollama error (attempt %s/3, status %s): %s", attempt + 1, e.status_code, e.error)
+                # e.g. model not found / bad request: retrying won't help
+                if 400 <= e.status_code < 500 and e.status_code != 429:
+                    break
             except Exception as e:
                 self.log.warning("Ollama error (attempt %s/3): %s", attempt + 1, e)
-            await asyncio.sleep(1.0 + attempt)
+            if attempt < 2:
+                # Exponential backoff with jitter so retries don't pile up on the daemon
+                base = 0.25 * (2 ** attempt)
+                await asyncio.sleep(base + random.random() * base)
 
         if not reply:
+            self.log.warning("Ollama gave no reply after %s/3 attempt(s).", attempt + 1)
             reply = "Sorry, my brain just lagged. Try again in a moment."
 
         # 6) Save assistant reply and send
@@ -452,6 +662,14 @@ class CrackGPTBot(discord.Client):
         except Exception as e:  # pragma: no cover
             self.log.warning("Failed to send message: %s", e)
 
+    async def channel_sweep_loop(self) -> None:
+        """Periodically forget channels that have gone quiet to bound memory."""
+        while True:
+            await asyncio.sleep(CHANNEL_SWEEP_INTERVAL_S)
+            removed = self.state.evict_idle(CHANNEL_IDLE_TTL_S)
+            if removed:
+                self.log.debug("Evicted %s idle channel(s).", removed)
+
     # ====================
     # Random Chatter Loop
     # ====================
@@ -464,38 +682,43 @@ class CrackGPTBot(discord.Client):
             wait_s = random.randint(self.cfg.random_interval_min_s, self.cfg.random_interval_max_s)
             await asyncio.sleep(wait_s)
 
-            # Choose a random active channel that's allowed
-            eligible_channels = [
-                cid for cid, st in self.state.channels.items()
-                if st.active and is_channel_allowed(cid, self.cfg.allowed_channels)
-            ]
-            if not eligible_channels:
+            # Choose up to random_batch_size active channels
+            if not self.state.active_channels:
                 continue
 
-            channel_id = random.choice(eligible_channels)
-            channel = self.get_channel(channel_id)
-            if not isinstance(channel, (discord.TextChannel, discord.Thread)):
-                continue
+            pool = tuple(self.state.active_channels)
+            chosen = random.sample(pool, min(len(pool), max(self.cfg.random_batch_size, 1)))
+            # Generate concurrently so Ollama can batch the requests server-side
+            await asyncio.gather(*(self._random_message_for(cid) for cid in chosen))
+
+    async def _random_message_for(self, channel_id: int) -> None:
+        channel = self.get_channel(channel_id)
+        if not is_channel_allowed(channel_id, self.cfg.allowed_channels) or not isinstance(
+            channel, (discord.TextChannel, discord.Thread)
+        ):
+            # Gone or no longer allowed; stop picking it
+            self.state.mark_inactive(channel_id)
+            return
 
-            # Build a prompt to generate a short message
-            history = self.state.get_history(channel_id)
-            sys_prompt = build_system_prompt(self.cfg, self.state.channels[channel_id].toggle_on)
-            messages = build_ollama_messages(sys_prompt, history)
-            try:
-                resp = await asyncio.wait_for(
-                    asyncio.to_thread(ollama.chat, model=self.cfg.ollama_model, messages=messages),
-                    timeout=self.cfg.ollama_timeout_sec,
-                )
-                random_msg = (resp or {}).get("message", {}).get("content", None)
-                if not random_msg:
-                    continue
-                history.append({"role": "assistant", "content": random_msg})
-                sent_message = await channel.send(random_msg)
-                # Track this message as sent by the bot
-                if sent_message:
-                    self.state.add_bot_message(channel_id, sent_message.id)
-            except Exception as e:  # pragma: no cover
-                self.log.debug("Random chatter skipped due to error: %s", e)
+        # Build a prompt to generate a short message
+        history = self.state.get_history(channel_id)
+        sys_prompt = self.state.system_prompt(channel_id)
+        messages = build_ollama_messages(sys_prompt, history)
+        try:
+            resp = await asyncio.wait_for(
+                self._ollama.chat(model=self.cfg.ollama_model, messages=messages),
+                timeout=self.cfg.ollama_timeout_sec,
+            )
+            random_msg = (resp or {}).get("message", {}).get("content", None)
+            if not random_msg:
+                return
+            history.append({"role": "assistant", "content": random_msg})
+            sent_message = await channel.send(random_msg)
+            # Track this message as sent by the bot
+            if sent_message:
+                self.state.add_bot_message(channel_id, sent_message.id)
+        except Exception as e:  # pragma: no cover
+            self.log.debug("Random chatter skipped due to error: %s", e)
 
 
 # ====================
@@ -533,21 +756,22 @@ async def amain(cfg: Config) -> int:
         except NotImplementedError:
             pass
 
-    async def _runner():
-        try:
-            await client.start(cfg.discord_token)
-        except discord.errors.LoginFailure:
-            logging.error("Invalid Discord bot token.")
-            return 1
-        except Exception as e:
-            logging.error("Bot crashed: %s", e)
-            return 1
-        return 0
-
-    runner = asyncio.create_task(_runner())
-    await stop_event.wait()
+    # Run until a signal arrives or the client stops on its own (e.g. bad token)
+    start_task = asyncio.create_task(client.start(cfg.discord_token))
+    stop_task = asyncio.create_task(stop_event.wait())
+    await asyncio.wait({start_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    stop_task.cancel()
     await client.close()
-    return await runner
+
+    try:
+        await start_task
+    except discord.errors.LoginFailure:
+        logging.error("Invalid Discord bot token.")
+        return 1
+    except Exception as e:
+        logging.error("Bot crashed: %s", e)
+        return 1
+    return 0
 
 def main() -> None:
     cfg = Config()